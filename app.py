@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from utils.data_loader import fetch_stock_data
 from utils.visualization import *
-from utils.portfolio import compute_portfolio_value, compute_portfolio_metrics,compute_sharpe_ratio,compute_sortino_ratio
+from utils.portfolio import compute_portfolio_value, compute_portfolio_metrics, compute_risk_ratios
 from utils.alerts import check_portfolio_drop, check_stock_drops, get_latest_market_changes
 
 
@@ -86,18 +87,20 @@ if load_data_clicked:
                 st.dataframe(data.tail())
 
                 # Latest Market Changes
-                st.markdown("### 📅 Latest Market Changes (Today vs Yesterday)")
-                latest_changes = get_latest_market_changes(tickers)
+                st.markdown("### 📅 Last Two Sessions in Range")
+                latest_changes = get_latest_market_changes(data)
                 if latest_changes.empty:
-                    st.info("No recent market data available (maybe market closed today).")
+                    st.info("Need at least two trading days in the selected range to compare.")
                 else:
-                    def color_change(val):
-                        if '⬆️' in val:
-                            return 'background-color: #d4edda; color: #155724;'
-                        elif '⬇️' in val:
-                            return 'background-color: #f8d7da; color: #721c24;'
-                        return ''
-                    styled_df = latest_changes.style.applymap(color_change, subset=['Change (%)'])
+                    prev_day, last_day = data.index[-2:]
+                    st.caption(f"{last_day:%b %d %Y} vs {prev_day:%b %d %Y}")
+                    def color_change(col):
+                        # Style the whole column at once instead of one callback per cell
+                        return np.where(
+                            col.str.contains('⬆️', regex=False), 'background-color: #d4edda; color: #155724;',
+                            np.where(col.str.contains('⬇️', regex=False), 'background-color: #f8d7da; color: #721c24;', '')
+                        )
+                    styled_df = latest_changes.style.apply(color_change, subset=['Change (%)'])
                     st.dataframe(styled_df, use_container_width=True, hide_index=True)
 
                 # Stock Line Chart
@@ -111,10 +114,15 @@ if not data.empty:
     if len(tickers) == 1:
         ticker = tickers[0]
         portfolio_value = data[ticker]
-        cumulative_return = (portfolio_value.iloc[-1] / portfolio_value.iloc[0] - 1) * 100
     else:
         portfolio_value = compute_portfolio_value(data, weights=weights)
-        cumulative_return = (portfolio_value.iloc[-1] / portfolio_value.iloc[0] - 1) * 100
+
+    # Materialize first/last values once and reuse them below
+    pv_np = portfolio_value.to_numpy()
+    pv_first, pv_last = pv_np[0], pv_np[-1]
+    first_row = data.iloc[0]
+    last_row = data.iloc[-1]
+    cumulative_return = (pv_last / pv_first - 1) * 100
 
     main_col, alert_col = st.columns([3, 1])
 
@@ -124,18 +132,16 @@ if not data.empty:
     with main_col:
         if len(tickers) > 1:
             st.subheader("📋 Portfolio Composition")
-            latest_prices = data.iloc[-1]
-            composition_numeric = []
-            total_portfolio_value = sum(weights[t] * latest_prices[t] for t in tickers)
-            for t in tickers:
-                pct_of_portfolio = (weights[t] * latest_prices[t] / total_portfolio_value) * 100
-                composition_numeric.append({
-                    "Ticker": t,
-                    "Weight (%)": weights[t] * 100,
-                    "Current Value ($)": weights[t] * latest_prices[t],
-                    "% of Portfolio": pct_of_portfolio
-                })
-            composition_df_numeric = pd.DataFrame(composition_numeric)
+            w = np.array([weights[t] for t in tickers])
+            latest_prices = last_row.reindex(tickers).to_numpy()
+            current_values = w * latest_prices
+            pct_of_portfolio = current_values / current_values.sum() * 100
+            composition_df_numeric = pd.DataFrame({
+                "Ticker": tickers,
+                "Weight (%)": w * 100,
+                "Current Value ($)": current_values,
+                "% of Portfolio": pct_of_portfolio
+            })
             composition_df_numeric.index+=1
             st.dataframe(composition_df_numeric, use_container_width=True)
 
@@ -150,8 +156,7 @@ if not data.empty:
         col3.metric("Annual Volatility", f"{metrics['Annual Volatility']*100:.2f}%")
         col4.metric("Max Drawdown", f"{metrics['Max Drawdown']*100:.2f}%")
        
-        sharpe = compute_sharpe_ratio(portfolio_value)
-        sortino = compute_sortino_ratio(portfolio_value)
+        sharpe, sortino = compute_risk_ratios(portfolio_value)
         col5, col6 = st.columns([1, 1], gap="small")
         col5.metric("Sharpe Ratio", f"{sharpe:.2f}")
         col6.metric("Sortino Ratio", f"{sortino:.2f}")
@@ -160,16 +165,15 @@ if not data.empty:
        
         if len(tickers) > 1:
             # Compute stock returns
-            stock_returns = (data.iloc[-1] / data.iloc[0] - 1) * 100
-            best_stock = stock_returns.idxmax()
-            best_return = stock_returns.max()
-            worst_stock = stock_returns.idxmin()
-            worst_return = stock_returns.min()
+            stock_returns = (last_row.to_numpy() / first_row.to_numpy() - 1) * 100
+            i_best, i_worst = stock_returns.argmax(), stock_returns.argmin()
+            best_stock, best_return = data.columns[i_best], stock_returns[i_best]
+            worst_stock, worst_return = data.columns[i_worst], stock_returns[i_worst]
 
             # Portfolio daily returns
             daily_portfolio_return = portfolio_value.pct_change().dropna()
             avg_daily_return = daily_portfolio_return.mean() * 100
-            total_gain_loss = (portfolio_value.iloc[-1] / portfolio_value.iloc[0] - 1) * 100
+            total_gain_loss = cumulative_return
 
             # Display in two columns (row 1)
             col7, col8 = st.columns([1, 1], gap="small")
@@ -230,12 +234,13 @@ if not data.empty:
 
         # Compute changes
         daily_change = data.pct_change() * 100
-        portfolio_pct_change = (portfolio_value / portfolio_value.iloc[0] - 1) * 100
-        latest_portfolio_change = portfolio_pct_change.iloc[-1]
+        portfolio_pct_change = (portfolio_value / pv_first - 1) * 100
+        latest_portfolio_change = cumulative_return
+        latest_daily_change = daily_change.iloc[-1]
 
         # Cumulative Alerts
-        portfolio_alert = check_portfolio_drop(portfolio_value, threshold_pct=portfolio_threshold)
-        stock_alerts = check_stock_drops(data, tickers, threshold_pct=stock_threshold)
+        portfolio_alert = check_portfolio_drop(portfolio_pct_change, threshold_pct=portfolio_threshold)
+        stock_alerts = check_stock_drops(daily_change, tickers, threshold_pct=stock_threshold)
 
         # Cumulative Alerts
         st.subheader("⚠️ Cumulative Alerts")
@@ -260,7 +265,7 @@ if not data.empty:
         # Stocks
         stock_alerted = False
         for t in tickers:
-            latest_stock_change = daily_change[t].iloc[-1]
+            latest_stock_change = latest_daily_change[t]
             if abs(latest_stock_change) >= stock_threshold:
                 stock_alerted = True
                 color = "green" if latest_stock_change > 0 else "red"
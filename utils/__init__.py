@@ -0,0 +1,6 @@
+# utils/__init__.py
+import pandas as pd
+
+# Let pandas dispatch reductions and elementwise ops to bottleneck/numexpr
+pd.set_option('compute.use_bottleneck', True)
+pd.set_option('compute.use_numexpr', True)
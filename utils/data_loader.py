@@ -1,52 +1,85 @@
 import yfinance as yf
 import pandas as pd
+import streamlit as st
+from joblib import Memory, expires_after
+
+# On-disk cache so downloads survive app restarts (yfinance rate-limits)
+memory = Memory("./.cache_yf", verbose=0)
+
+
+def _download(tickers, start_date, end_date):
+    # Pin the layout: always (field, ticker) columns with an "Adj Close" field,
+    # and let yfinance fetch tickers on parallel threads
+    return yf.download(
+        list(tickers), start=start_date, end=end_date,
+        auto_adjust=False, group_by='column', multi_level_index=True,
+        threads=True, progress=False
+    )
+
+
+class IncompleteDownloadError(Exception):
+    """Raised inside the cached loaders so a failed or partial download is never stored."""
+
+    def __init__(self, data):
+        super().__init__("yfinance returned no Adj Close data for some tickers")
+        self.data = data
+
+
+def _download_checked(tickers, start_date, end_date):
+    # yf.download swallows per-ticker errors (incl. rate limits) and returns NaN
+    # columns, so verify every ticker has Adj Close data before anything is cached
+    data = _download(tickers, start_date, end_date)
+    if data.empty or "Adj Close" not in data.columns.get_level_values(0):
+        raise IncompleteDownloadError(data)
+    adj_close = data["Adj Close"]
+    if not all(t in adj_close.columns and adj_close[t].notna().any() for t in tickers):
+        raise IncompleteDownloadError(data)
+    return data
+
+
+# Adj Close for past dates is rewritten after every later dividend or split,
+# so even closed ranges go stale; expire disk entries daily
+_download_history = memory.cache(
+    _download_checked, cache_validation_callback=expires_after(days=1)
+)
+
 
 def fetch_stock_data(tickers, start_date, end_date):
     """
-    Fetch historical stock prices (Adj Close preferred) for given tickers and date range.
+    Fetch historical stock prices (Adj Close) for given tickers and date range.
     Returns a DataFrame with dates as index and tickers as columns.
     """
+    try:
+        # Lists aren't hashable, so key the cache on a tuple
+        return _fetch_stock_data(tuple(tickers), start_date, end_date)
+    except IncompleteDownloadError as e:
+        # Use the partial result for this run only, the next one downloads again
+        return _clean_prices(e.data, start_date, end_date)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_stock_data(tickers, start_date, end_date):
+    # Ranges reaching today gain new rows during the session, keep them off disk
+    if pd.Timestamp(end_date) < pd.Timestamp.today().normalize():
+        data = _download_history(tickers, start_date, end_date)
+    else:
+        data = _download_checked(tickers, start_date, end_date)
+    return _clean_prices(data, start_date, end_date)
 
-    data = yf.download(tickers, start=start_date, end=end_date)
 
+def _clean_prices(data, start_date, end_date):
     # Drop empty columns upfront (invalid tickers)
     data = data.dropna(axis=1, how='all')
 
-    if data.empty:
+    if data.empty or "Adj Close" not in data.columns.get_level_values(0):
         return pd.DataFrame()
 
-    # Select Adj Close or Close
-    if isinstance(data.columns, pd.MultiIndex):
-        if "Adj Close" in data.columns.get_level_values(0):
-            data = data["Adj Close"]
-        else:
-            data = data["Close"]
-    else:
-        # Single ticker path
-        if "Adj Close" in data.columns:
-            data = data[["Adj Close"]]
-        else:
-            data = data[["Close"]]
-
-    # ---- FIXED COLUMN FLATTENING ----
-    if isinstance(data.columns, pd.MultiIndex):
-        # Multi-ticker, extract ticker symbols
-        data.columns = data.columns.get_level_values(1)
-    else:
-        # Single ticker → tickers is a list
-        if len(tickers) == 1:
-            data.columns = [tickers[0].upper()]
-        else:
-            # yfinance may still give weird format → fallback
-            data.columns = [str(c).upper() for c in data.columns]
-
-    # Fill missing values
-    data = data.fillna(method='ffill').fillna(method='bfill')
+    # Columns are ticker symbols under the "Adj Close" field
+    data = data["Adj Close"]
 
-    # Remove bad tickers again
-    data = data.dropna(axis=1, how='all')
-    if data.empty:
-        return pd.DataFrame()
+    # Fill missing values (ffill makes a fresh frame, so bfill can run in place)
+    data = data.ffill()
+    data.bfill(inplace=True)
 
     # Apply date range
     data = data.loc[start_date:end_date]
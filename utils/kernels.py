@@ -0,0 +1,90 @@
+# utils/kernels.py
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def cummax_drawdown(prices):
+    """
+    Drawdown from the running peak, (p - peak) / peak, in a single fused loop.
+
+    Args:
+        prices (np.ndarray): 1-D float array of prices or portfolio values
+
+    Returns:
+        np.ndarray: drawdown at each point (0 at a new peak, negative below it)
+    """
+    n = prices.shape[0]
+    drawdown = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return drawdown
+
+    running_max = prices[0]
+    for i in range(n):
+        if prices[i] > running_max:
+            running_max = prices[i]
+        drawdown[i] = (prices[i] - running_max) / running_max
+    return drawdown
+
+
+@njit(cache=True, fastmath=True)
+def rolling_mean(prices, window):
+    """
+    Simple moving average over a trailing window using a sliding sum, O(T).
+    The first window - 1 values are NaN, matching pandas .rolling(window).mean().
+
+    Args:
+        prices (np.ndarray): 1-D float array
+        window (int): window length
+
+    Returns:
+        np.ndarray: moving average
+    """
+    n = prices.shape[0]
+    out = np.full(n, np.nan)
+    window_sum = 0.0
+    for i in range(n):
+        window_sum += prices[i]
+        if i >= window:
+            window_sum -= prices[i - window]
+        if i >= window - 1:
+            out[i] = window_sum / window
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def macd_kernel(prices):
+    """
+    MACD (12/26 EMA) with its 9-period signal line in a single pass.
+    Each EMA matches pandas .ewm(span=..., adjust=False).mean().
+
+    Args:
+        prices (np.ndarray): 1-D float array of prices
+
+    Returns:
+        tuple: (macd, signal, hist) arrays
+    """
+    n = prices.shape[0]
+    macd = np.empty(n, dtype=np.float64)
+    signal = np.empty(n, dtype=np.float64)
+    hist = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return macd, signal, hist
+
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    ema12 = prices[0]
+    ema26 = prices[0]
+    sig = 0.0
+    for i in range(n):
+        ema12 = a12 * prices[i] + (1.0 - a12) * ema12
+        ema26 = a26 * prices[i] + (1.0 - a26) * ema26
+        macd[i] = ema12 - ema26
+        if i == 0:
+            sig = macd[0]
+        else:
+            sig = a9 * macd[i] + (1.0 - a9) * sig
+        signal[i] = sig
+        hist[i] = macd[i] - sig
+    return macd, signal, hist
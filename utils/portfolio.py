@@ -1,6 +1,7 @@
 # utils/portfolio.py
 import pandas as pd
 import numpy as np
+from utils.kernels import cummax_drawdown
 
 def compute_portfolio_value(data, weights=None, initial_value=100000):
     """
@@ -26,14 +27,14 @@ def compute_portfolio_value(data, weights=None, initial_value=100000):
         weights = {k: v/total_weight for k, v in weights.items()}
 
     # Align weights with data columns
-    weights_list = [weights[ticker] for ticker in data.columns]
+    w = np.array([weights[ticker] for ticker in data.columns])
 
-    # Calculate daily portfolio value
-    normalized_prices = data / data.iloc[0]  # start at 1
-    weighted_prices = normalized_prices * weights_list
-    portfolio_value = weighted_prices.sum(axis=1) * initial_value
+    # Calculate daily portfolio value: fold the start-at-1 normalization into
+    # the weights so a single matrix-vector product needs no T x N temporary
+    prices = data.to_numpy()
+    portfolio_value = prices @ (w / prices[0]) * initial_value
 
-    return portfolio_value
+    return pd.Series(portfolio_value, index=data.index)
 
 def compute_portfolio_metrics(portfolio_value):
     """
@@ -45,11 +46,12 @@ def compute_portfolio_metrics(portfolio_value):
     Returns:
         dict: metrics
     """
-    daily_returns = portfolio_value.pct_change().dropna()
-    cumulative_return = (portfolio_value[-1] / portfolio_value[0]) - 1
-    annual_volatility = daily_returns.std() * (252 ** 0.5)
-    running_max = portfolio_value.cummax()
-    max_drawdown = (portfolio_value - running_max).min() / running_max.max()
+    pv = np.asarray(portfolio_value, dtype=float)
+    daily_returns = np.diff(pv) / pv[:-1]
+    cumulative_return = (pv[-1] / pv[0]) - 1
+    annual_volatility = daily_returns.std(ddof=1) * (252 ** 0.5)
+    # Drawdown is relative to the running peak at each point in time
+    max_drawdown = cummax_drawdown(pv).min()
 
     return {
         "Cumulative Return": cumulative_return,
@@ -57,23 +59,23 @@ def compute_portfolio_metrics(portfolio_value):
         "Max Drawdown": max_drawdown
     }
 
-def compute_sharpe_ratio(portfolio_values, risk_free_rate=0.02):
+def compute_risk_ratios(portfolio_values, risk_free_rate=0.02):
     """
-    Compute annualized Sharpe Ratio assuming daily data.
-    """
-    daily_returns = portfolio_values.pct_change().dropna()
-    excess_returns = daily_returns - risk_free_rate/252
-    sharpe_ratio = (excess_returns.mean() / excess_returns.std()) * np.sqrt(252)
-    return sharpe_ratio
+    Compute annualized Sharpe and Sortino Ratios in one pass, assuming daily data.
 
-def compute_sortino_ratio(portfolio_values, risk_free_rate=0.02):
-    """
-    Compute annualized Sortino Ratio assuming daily data.
+    Returns:
+        tuple: (sharpe_ratio, sortino_ratio)
     """
-    daily_returns = portfolio_values.pct_change().dropna()
+    pv = np.asarray(portfolio_values, dtype=float)
+    daily_returns = np.diff(pv) / pv[:-1]
     excess_returns = daily_returns - risk_free_rate/252
-    downside_std = daily_returns[daily_returns < 0].std()
-    if downside_std == 0:
-        return np.nan
-    sortino_ratio = (excess_returns.mean() / downside_std) * np.sqrt(252)
-    return sortino_ratio
+    mean_excess = excess_returns.mean()
+
+    sharpe_ratio = (mean_excess / excess_returns.std(ddof=1)) * np.sqrt(252)
+
+    downside_std = daily_returns[daily_returns < 0].std(ddof=1)
+    if downside_std == 0 or np.isnan(downside_std):
+        sortino_ratio = np.nan
+    else:
+        sortino_ratio = (mean_excess / downside_std) * np.sqrt(252)
+    return sharpe_ratio, sortino_ratio
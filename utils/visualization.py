@@ -2,9 +2,11 @@
 import plotly.express as px
 import streamlit as st
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sb
 import plotly.graph_objects as go
+from utils.kernels import cummax_drawdown, rolling_mean, macd_kernel
 
 def plot_stock_trends(data, title="Stock Price Trend"):
     """
@@ -14,19 +16,15 @@ def plot_stock_trends(data, title="Stock Price Trend"):
         st.warning("No data to plot.")
         return
 
-    # Reset index to have 'Date' as a column
-    plot_data = data.reset_index().rename(columns={'index':'Date'})
+    # One WebGL trace per ticker, straight from the wide frame (no melt to long format)
+    fig = go.Figure()
+    for ticker in data.columns:
+        fig.add_trace(go.Scattergl(x=data.index, y=data[ticker], name=ticker, mode='lines'))
 
-    # Multi-stock handling: melt to long format
-    if len(data.columns) > 1:
-        df_long = plot_data.melt(id_vars=['Date'], value_vars=data.columns,
-                                 var_name='Ticker', value_name='Price')
-        fig = px.line(df_long, x='Date', y='Price', color='Ticker', title=title,
-                      hover_data={'Date': True, 'Price': ':.2f', 'Ticker': False})
-    else:
-        ticker = data.columns[0]
-        fig = px.line(plot_data, x='Date', y=ticker, title=f"{ticker} Price Trend",
-                      hover_data={'Date': True, ticker: ':.2f'})
+    if len(data.columns) == 1:
+        title = f"{data.columns[0]} Price Trend"
+    fig.update_layout(title=title, xaxis_title='Date', yaxis_title='Price',
+                      legend_title_text='Ticker')
 
     # Format hover and x-axis ticks
     fig.update_xaxes(tickformat="%b %d %Y", hoverformat="%b %d %Y")
@@ -80,17 +78,19 @@ def plot_portfolio_contributions(data, weights):
     """
     Plot portfolio contributions as an interactive stacked area chart using Plotly.
     """
-    # Compute weighted portfolio for each stock
-    df = data.copy()
-    for t in weights:
-        df[t] = df[t] * weights[t]
-    df['Date'] = df.index
-
-    fig = px.area(df, x='Date', y=list(weights.keys()),
-                  title="Portfolio Contributions Over Time",
-                  labels={'value': 'Value ($)', 'variable': 'Stock'},
-                  template='plotly_white')
-    fig.update_layout(legend_title_text='Stocks')
+    # Compute weighted portfolio for each stock in one broadcast multiply
+    prices = data.to_numpy()
+    w = np.array([weights[t] for t in data.columns], dtype=prices.dtype)
+    df = pd.DataFrame(prices * w, index=data.index, columns=data.columns)
+
+    # Stacked traces built directly from the wide frame (Scattergl can't stack)
+    fig = go.Figure()
+    for t in df.columns:
+        fig.add_trace(go.Scatter(x=df.index, y=df[t], name=t, mode='lines', stackgroup='one'))
+
+    fig.update_layout(title="Portfolio Contributions Over Time",
+                      xaxis_title='Date', yaxis_title='Value ($)',
+                      legend_title_text='Stocks', template='plotly_white')
     st.plotly_chart(fig, use_container_width=True)
     
 def plot_daily_returns_distribution(portfolio_value):
@@ -141,16 +141,20 @@ def plot_candlestick(df, ticker):
     st.plotly_chart(fig, use_container_width=True)
     
 def plot_moving_averages(df, ticker):
-    df_copy = df.copy()
-    df_copy['SMA_20'] = df_copy[ticker].rolling(20).mean()
-    df_copy['SMA_50'] = df_copy[ticker].rolling(50).mean()
+    prices = df[ticker]
+    values = prices.to_numpy(dtype=np.float64)
+    ma_df = pd.DataFrame({
+        ticker: prices,
+        'SMA_20': rolling_mean(values, 20),
+        'SMA_50': rolling_mean(values, 50)
+    }, index=df.index)
 
-    st.area_chart(df_copy[[ticker, 'SMA_20', 'SMA_50']])
+    st.area_chart(ma_df)
 
 def plot_drawdown(df, ticker):
     prices = df[ticker]
-    cum_max = prices.cummax()
-    drawdown = (prices - cum_max) / cum_max * 100  # % drawdown
+    drawdown = cummax_drawdown(prices.to_numpy(dtype=np.float64)) * 100  # % drawdown
+    drawdown = pd.Series(drawdown, index=prices.index, name=ticker)
     st.line_chart(drawdown, height=300)
     st.caption("Drawdown (%) from peak")
     
@@ -166,13 +170,8 @@ def plot_macd(data, ticker):
 
     prices = data[ticker]
 
-    # Compute EMAs
-    ema12 = prices.ewm(span=12, adjust=False).mean()
-    ema26 = prices.ewm(span=26, adjust=False).mean()
-
-    macd = ema12 - ema26
-    signal = macd.ewm(span=9, adjust=False).mean()
-    hist = macd - signal
+    # EMAs, MACD, signal and histogram in one fused pass
+    macd, signal, hist = macd_kernel(prices.to_numpy(dtype=np.float64))
 
     # Plot
     fig = go.Figure()